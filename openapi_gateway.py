@@ -1,11 +1,22 @@
 import os
-import json
+import hashlib
+import http.cookiejar
 import logging
+import logging.config
+import tempfile
 from fastapi import FastAPI, Request, HTTPException, Response
-from fastapi.routing import APIRoute
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.datastructures import MutableHeaders
+import fastjsonschema
 import httpx
+import orjson
 from openapi_spec_validator import validate_spec
-from jsonschema import validate as jsonschema_validate, ValidationError
+from jsonschema import Draft4Validator, Draft202012Validator, ValidationError
+from jsonschema.exceptions import SchemaError
+from jsonschema.validators import validator_for
+from referencing import Registry
+from referencing.jsonschema import DRAFT202012
 
 
 # Set up logging based on environment variable
@@ -20,7 +31,7 @@ LOGGING_CONFIG = {
     },
     "handlers": {
         "default": {
-            "level": "INFO",
+            "level": log_level,
             "formatter": "standard",
             "class": "logging.StreamHandler",
             "stream": "ext://sys.stdout",  # Default is stderr
@@ -47,91 +58,353 @@ logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger(__name__)
 
 app = FastAPI()
+# Set once startup has loaded the spec and registered all routes
+app.state.ready = False
+
+# Resolved once at import time rather than on every request
+OPENAPI_SPEC_PATH = os.getenv("OPENAPI_SPEC_PATH", "openapi.json")
+UPSTREAM_SERVER_URL = os.getenv("UPSTREAM_SERVER_URL", "https://example.com/api").rstrip('/')
+
+# Headers that only apply to a single connection and must not be forwarded.
+# Names are lowercased bytes so raw header lists can be checked without decoding.
+HOP_BY_HOP_HEADERS = frozenset((
+    b'connection',
+    b'keep-alive',
+    b'proxy-authenticate',
+    b'proxy-authorization',
+    b'te',
+    b'trailer',
+    b'transfer-encoding',
+    b'upgrade',
+))
+EXCLUDED_REQUEST_HEADERS = HOP_BY_HOP_HEADERS | {b'host'}
+EXCLUDED_RESPONSE_HEADERS = HOP_BY_HOP_HEADERS | {
+    b'server',
+    b'content-length',  # The body is streamed, so it is sent chunked
+}
+
+# HTTP methods for which routes are registered from the spec
+ALLOWED_METHODS = frozenset(("GET", "POST", "PUT", "DELETE", "PATCH"))
+
+# HTTP methods whose request body is validated against the spec
+BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+
+# Keywords introduced in JSON Schema 2019-09 and 2020-12. OpenAPI 3.0 bodies are
+# validated as draft-04, which would silently ignore them.
+MODERN_SCHEMA_KEYWORDS = frozenset((
+    '$anchor',
+    '$defs',
+    '$dynamicAnchor',
+    '$dynamicRef',
+    '$recursiveAnchor',
+    '$recursiveRef',
+    '$vocabulary',
+    'contentSchema',
+    'dependentRequired',
+    'dependentSchemas',
+    'maxContains',
+    'minContains',
+    'prefixItems',
+    'unevaluatedItems',
+    'unevaluatedProperties',
+))
+# Keywords that never affect validation, so they are harmless next to $ref
+ANNOTATION_KEYWORDS = frozenset((
+    '$comment',
+    'default',
+    'deprecated',
+    'description',
+    'discriminator',
+    'example',
+    'examples',
+    'externalDocs',
+    'nullable',
+    'readOnly',
+    'title',
+    'writeOnly',
+    'xml',
+))
+# Keywords whose values are instance data rather than subschemas
+DATA_KEYWORDS = frozenset(('const', 'default', 'enum', 'example', 'examples'))
+
+# Base URI under which the whole spec is registered, so that request body
+# schemas can resolve "#/components/..." references against the spec root.
+SPEC_URI = "urn:openapi-gateway:spec"
+
+# JSON Schema dialect of OpenAPI 3.0 schema objects
+DRAFT4_SCHEMA_URI = "http://json-schema.org/draft-04/schema#"
 
 def load_openapi_spec(spec_path):
-    logger.info(f"Loading OpenAPI specification from {spec_path}")
+    logger.info("Loading OpenAPI specification from %s", spec_path)
     try:
-        with open(spec_path, 'r') as f:
-            spec = json.load(f)
+        with open(spec_path, 'rb') as f:
+            raw_spec = f.read()
+        spec = orjson.loads(raw_spec)
+
+        # Validating a large spec is slow, so remember specs that already passed by content hash
+        spec_hash = hashlib.blake2b(raw_spec, digest_size=16).hexdigest()
+        marker_path = os.path.join(tempfile.gettempdir(), f"openapi_gateway_validated_{spec_hash}")
+        if os.path.exists(marker_path):
+            logger.info("OpenAPI specification unchanged since last validation, skipping validation")
+            return spec
+
         validate_spec(spec)  # Validate the OpenAPI spec structure
         logger.info("OpenAPI specification validated successfully")
+        try:
+            open(marker_path, 'a').close()
+        except OSError as e:
+            logger.warning("Could not cache OpenAPI specification validation result: %s", e)
         return spec
-    except (json.JSONDecodeError, FileNotFoundError) as e:
-        logger.error(f"Failed to load OpenAPI specification: {str(e)}")
+    except (orjson.JSONDecodeError, FileNotFoundError) as e:
+        logger.error("Failed to load OpenAPI specification: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Failed to validate OpenAPI specification: {str(e)}")
+        logger.error("Failed to validate OpenAPI specification: %s", e)
         raise
 
-def find_operation(path: str, method: str, spec: dict):
-    """Find the operation definition for a given path and method."""
-    # Normalize path parameters
-    path_parts = path.split('/')
-    for path_template, path_item in spec['paths'].items():
-        template_parts = path_template.split('/')
-        if len(path_parts) != len(template_parts):
-            continue
+def build_schema_registry(spec: dict) -> Registry:
+    """Register the OpenAPI spec once so $ref lookups are resolved against it."""
+    return Registry().with_resource(SPEC_URI, DRAFT202012.create_resource(spec))
 
-        matches = True
-        for part, template in zip(path_parts, template_parts):
-            if template.startswith('{') and template.endswith('}'):
-                continue
-            if part != template:
-                matches = False
-                break
+def json_pointer(*parts) -> str:
+    """Build a JSON pointer from unescaped path segments."""
+    return "".join("/" + str(part).replace('~', '~0').replace('/', '~1') for part in parts)
+
+def resolve_ref(spec: dict, node, pointer: str):
+    """
+    Follow local "#/..." references until a concrete object is reached.
+    Returns the object together with the JSON pointer of its location in the spec.
+    Raises ValueError if a reference cannot be resolved.
+    """
+    seen = set()
+    while isinstance(node, dict) and '$ref' in node:
+        ref = node['$ref']
+        if not isinstance(ref, str) or not ref.startswith('#/') or ref in seen:
+            raise ValueError(f"Cannot resolve reference {ref!r}")
+        seen.add(ref)
+
+        pointer = ref[1:]
+        node = spec
+        try:
+            for part in ref[2:].split('/'):
+                part = part.replace('~1', '/').replace('~0', '~')
+                node = node[int(part)] if isinstance(node, list) else node[part]
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise ValueError(f"Cannot resolve reference {ref!r}")
+    return node, pointer
+
+def needs_modern_dialect(schema, spec: dict, seen: set = None) -> bool:
+    """
+    Check whether a schema, including the schemas it references, relies on
+    JSON Schema 2019-09 or later semantics.
+    """
+    if seen is None:
+        seen = set()
+    if isinstance(schema, list):
+        return any(needs_modern_dialect(item, spec, seen) for item in schema)
+    if not isinstance(schema, dict):
+        return False
+    if not MODERN_SCHEMA_KEYWORDS.isdisjoint(schema):
+        return True
+
+    if '$ref' in schema:
+        # Before 2019-09, keywords next to $ref are ignored
+        if any(
+            key != '$ref' and key not in ANNOTATION_KEYWORDS and not key.startswith('x-')
+            for key in schema
+        ):
+            return True
+        if schema['$ref'] in seen:
+            return False
+        seen.add(schema['$ref'])
+        try:
+            target, _ = resolve_ref(spec, schema, '')
+        except ValueError:
+            return True
+        return needs_modern_dialect(target, spec, seen)
+
+    return any(
+        needs_modern_dialect(value, spec, seen)
+        for key, value in schema.items()
+        if key not in DATA_KEYWORDS
+    )
+
+def compile_body_validator(path: str, method: str, operation_def: dict, spec: dict, registry: Registry):
+    """
+    Build a reusable validator for the JSON request body of an operation.
+    Returns a callable that raises on invalid bodies, or None if the operation
+    does not accept a JSON body.
+    """
+    if 'requestBody' not in operation_def:
+        return None
+
+    # The request body may itself be a reference to #/components/requestBodies
+    request_body, body_pointer = resolve_ref(
+        spec, operation_def['requestBody'], json_pointer('paths', path, method, 'requestBody')
+    )
+    content = request_body.get('content', {})
+    if 'application/json' not in content:
+        return None
+
+    schema = content['application/json'].get('schema', {})
+    # OpenAPI 3.0 schemas follow draft-04 (e.g. boolean exclusiveMinimum), while
+    # OpenAPI 3.1 and any 2019-09+ keywords need Draft 2020-12.
+    modern = not str(spec.get('openapi', '')).startswith('3.0.') or needs_modern_dialect(schema, spec)
+    validator_cls = validator_for(schema, default=Draft202012Validator) if modern else Draft4Validator
+    try:
+        validator_cls.check_schema(schema)
+    except SchemaError as e:
+        # One unusable schema must not keep the rest of the spec from being served
+        logger.error("Not validating %s %s request body, invalid schema: %s", method.upper(), path, e.message)
+        return None
 
-        if matches and method.lower() in path_item:
-            return path_item[method.lower()]
+    # Point at the schema inside the spec rather than validating the bare
+    # schema, otherwise its local references cannot be resolved.
+    pointer = body_pointer + json_pointer('content', 'application/json', 'schema')
+    jsonschema_validator = validator_cls({"$ref": f"{SPEC_URI}#{pointer}"}, registry=registry).validate
 
-    return None
+    # fastjsonschema only implements drafts 4 to 7, so leave the rest to jsonschema
+    if modern:
+        return jsonschema_validator
 
-def validate_parameters(request: Request, operation_def: dict):
+    try:
+        # fastjsonschema generates Python code specialised to this schema.
+        # $schema pins draft-04 as its default is draft-07, where a boolean
+        # exclusiveMinimum means 1. Draft-04 ignores the spec keys next to $ref.
+        return fastjsonschema.compile(
+            {**spec, "$schema": DRAFT4_SCHEMA_URI, "$ref": f"#{pointer}"},
+            use_default=False,
+            use_formats=False,
+        )
+    except fastjsonschema.JsonSchemaDefinitionException as e:
+        logger.warning("Using jsonschema to validate %s %s request body: %s", method.upper(), path, e)
+        return jsonschema_validator
+
+def compile_query_plan(path: str, method: str, operation_def: dict, spec: dict):
+    """
+    Flatten the query parameter rules of an operation so that requests can be
+    checked without walking the parameter definitions each time. Error messages
+    are built here as well, since they only depend on the spec.
+    """
+    required = []
+    enums = {}
+    for index, param in enumerate(operation_def.get('parameters', [])):
+        # Parameters and their schemas are often references into #/components
+        try:
+            param, param_pointer = resolve_ref(spec, param, json_pointer('paths', path, method, 'parameters', index))
+            schema, _ = resolve_ref(spec, param.get('schema', {}), param_pointer + '/schema')
+        except ValueError as e:
+            logger.error("Skipping parameter %d of %s %s: %s", index, method.upper(), path, e)
+            continue
+
+        if param.get('in') != 'query':
+            continue
+        param_name = param['name']
+        if param.get('required', False):  # Default to False if not specified
+            required.append((param_name, f"Missing required query parameter: {param_name}"))
+
+        enum = schema.get('enum')
+        if enum is not None:
+            enums[param_name] = (
+                frozenset(enum),
+                f"Invalid value for {param_name}. Must be one of: {', '.join(map(str, enum))}",
+            )
+
+    # Required names keep their declaration order so the reported missing parameter is stable
+    return tuple(required), enums
+
+def validate_parameters(request: Request, query_required: tuple, query_enums: dict):
     """
     Validate request parameters against OpenAPI specification.
     Handles both required and optional parameters.
     """
-    query_params = dict(request.query_params)
-    if 'parameters' in operation_def:
-        for param in operation_def['parameters']:
-            if param['in'] == 'query':
-                param_name = param['name']
-                is_required = param.get('required', False)  # Default to False if not specified
-
-                # Check required parameters
-                if is_required and param_name not in query_params:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Missing required query parameter: {param_name}"
-                    )
-
-                # Validate enum if parameter is present (regardless of required status)
-                if param_name in query_params and 'schema' in param:
-                    schema = param['schema']
-                    if 'enum' in schema and query_params[param_name] not in schema['enum']:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Invalid value for {param_name}. Must be one of: {', '.join(schema['enum'])}"
-                        )
-
-async def validate_request_body(request: Request, operation_def: dict):
+    query_params = request.query_params
+
+    # Check required parameters
+    for param_name, detail in query_required:
+        if param_name not in query_params:
+            raise HTTPException(status_code=400, detail=detail)
+
+    # Validate enum if parameter is present (regardless of required status)
+    for param_name, (allowed, detail) in query_enums.items():
+        if param_name in query_params and query_params[param_name] not in allowed:
+            raise HTTPException(status_code=400, detail=detail)
+
+def validate_request_body(request: Request, body: bytes, body_validator):
+    """
+    Validate a JSON request body against the operation's compiled schema.
+    Only called for operations that expect a JSON body.
+    """
     content_type = request.headers.get('content-type')
-    if request.method in ["POST", "PUT", "PATCH"] and 'requestBody' in operation_def:
-        request_body_spec = operation_def['requestBody']
-
-        if 'application/json' in request_body_spec['content']:
-            if content_type != "application/json":
-                raise HTTPException(
-                    status_code=415,
-                    detail="Unsupported Media Type. Expected 'application/json'"
-                )
-            try:
-                request_body = await request.json()
-                schema = request_body_spec['content']['application/json']['schema']
-                jsonschema_validate(instance=request_body, schema=schema)
-            except ValidationError as e:
-                raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
-            except json.JSONDecodeError:
-                raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if content_type != "application/json":
+        raise HTTPException(
+            status_code=415,
+            detail="Unsupported Media Type. Expected 'application/json'"
+        )
+    try:
+        body_validator(orjson.loads(body))
+    except (fastjsonschema.JsonSchemaValueException, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {e.message}")
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+
+def passthrough_body(request: Request):
+    """
+    Stream the client's body to upstream as it arrives instead of buffering it.
+    Requests that carry no body are forwarded without one.
+    """
+    if 'content-length' in request.headers or 'transfer-encoding' in request.headers:
+        return request.stream()
+    return b''
+
+def make_endpoint(
+    http_method: str,
+    body_validator,
+    query_required: tuple,
+    query_enums: dict,
+    http_client: httpx.AsyncClient,
+):
+    """
+    Build the route handler for an operation.
+    The precomputed validation rules are bound directly into the handler, and
+    validation steps the operation has nothing to check for are left out entirely.
+    """
+    needs_params = bool(query_required or query_enums)
+    needs_body = http_method in BODY_METHODS and body_validator is not None
+
+    if needs_params and needs_body:
+        async def endpoint(request: Request):
+            validate_parameters(request, query_required, query_enums)
+            # Read the body once and share it between validation and forwarding
+            body = await request.body()
+            validate_request_body(request, body, body_validator)
+            return await forward_request(request, body, http_client)
+    elif needs_body:
+        async def endpoint(request: Request):
+            body = await request.body()
+            validate_request_body(request, body, body_validator)
+            return await forward_request(request, body, http_client)
+    elif needs_params:
+        async def endpoint(request: Request):
+            validate_parameters(request, query_required, query_enums)
+            return await forward_request(request, passthrough_body(request), http_client)
+    else:
+        async def endpoint(request: Request):
+            return await forward_request(request, passthrough_body(request), http_client)
+
+    return endpoint
+
+# Probe responses never change, so they are serialised once and reused
+HEALTHY_RESPONSE = Response(content=b'{"status":"healthy"}', media_type="application/json")
+READY_RESPONSE = Response(content=b'{"status":"ready"}', media_type="application/json")
+NOT_READY_RESPONSE = Response(
+    content=orjson.dumps({
+        "status": "not ready",
+        "reason": "OpenAPI specification not loaded"
+    }),
+    status_code=503,
+    media_type="application/json"
+)
 
 @app.get("/health")
 async def health_check():
@@ -139,7 +412,7 @@ async def health_check():
     Basic health check endpoint for Kubernetes liveness probe.
     Verifies that the application is running and can handle requests.
     """
-    return {"status": "healthy"}
+    return HEALTHY_RESPONSE
 
 @app.get("/ready")
 async def readiness_check():
@@ -147,70 +420,84 @@ async def readiness_check():
     Readiness check endpoint for Kubernetes readiness probe.
     Verifies that the OpenAPI spec is loaded and the gateway can process requests.
     """
-    try:
-        # Check if OpenAPI spec is loaded
-        if not hasattr(app, 'openapi_spec'):
-            return Response(
-                content=json.dumps({
-                    "status": "not ready",
-                    "reason": "OpenAPI specification not loaded"
-                }),
-                status_code=503,
-                media_type="application/json"
-            )
+    return READY_RESPONSE if app.state.ready else NOT_READY_RESPONSE
 
-        return {"status": "ready"}
-    except Exception as e:
-        logger.error(f"Readiness check failed: {str(e)}")
-        return Response(
-            content=json.dumps({
-                "status": "not ready",
-                "reason": str(e)
-            }),
-            status_code=503,
-            media_type="application/json"
-        )
+def create_upstream_client(transport: httpx.AsyncBaseTransport = None) -> httpx.AsyncClient:
+    """
+    Create the client used to forward requests upstream.
+    `transport` replaces the network transport, e.g. with an in-process ASGI app in tests.
+    """
+    client = httpx.AsyncClient(
+        base_url=UPSTREAM_SERVER_URL,
+        http2=True,
+        timeout=30.0,  # 30 second timeout for upstream requests
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=200, max_connections=1000),
+        # The client is shared by all callers, so it must never store upstream
+        # cookies; clients' own Cookie headers are forwarded as-is. The jar is
+        # passed directly, as httpx copies an httpx.Cookies into a default jar.
+        cookies=http.cookiejar.CookieJar(
+            policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+        ),
+        transport=transport,
+    )
+    # Response bodies are relayed undecoded, so only ask upstream for the
+    # encodings the client itself accepts
+    del client.headers['accept-encoding']
+    return client
 
 @app.on_event("startup")
 async def startup_event():
-    openapi_spec_path = os.getenv("OPENAPI_SPEC_PATH", "openapi.json")
-    app.openapi_spec = load_openapi_spec(openapi_spec_path)
+    app.openapi_spec = load_openapi_spec(OPENAPI_SPEC_PATH)
     logger.info("API Gateway initialized")
 
+    # Shared upstream client so connections (and TLS sessions) are pooled across requests
+    app.state.http_client = create_upstream_client()
+
+    registry = build_schema_registry(app.openapi_spec)
+
     # Register routes
     for path, path_def in app.openapi_spec["paths"].items():
         for method, operation_def in path_def.items():
-            if method.upper() not in {"GET", "POST", "PUT", "DELETE", "PATCH"}:
+            http_method = method.upper()
+            if http_method not in ALLOWED_METHODS:
                 continue
 
-            logger.info(f"Registering route: {method.upper()} {path}")
+            # Compile the validation rules once instead of on every request
+            body_validator = compile_body_validator(path, method, operation_def, app.openapi_spec, registry)
+            query_required, query_enums = compile_query_plan(path, method, operation_def, app.openapi_spec)
 
-            async def endpoint(request: Request, op_def=operation_def):
-                # Validate against the OpenAPI spec
-                validate_parameters(request, op_def)
-                await validate_request_body(request, op_def)
-                return await forward_request(request)
+            logger.info("Registering route: %s %s", http_method, path)
 
             app.router.add_api_route(
                 path,
-                endpoint=endpoint,
-                methods=[method.upper()],
+                endpoint=make_endpoint(
+                    http_method,
+                    body_validator,
+                    query_required,
+                    query_enums,
+                    app.state.http_client,
+                ),
+                methods=[http_method],
             )
 
-def filter_headers(headers: dict) -> dict:
+    app.state.ready = True
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await app.state.http_client.aclose()
+
+def filter_headers(raw_headers: list) -> MutableHeaders:
     """Filter and clean response headers."""
-    # List of headers that should not be forwarded
-    excluded_headers = {
-        'server',
-        'transfer-encoding',
-        'content-encoding',  # We'll handle this separately based on actual content
-        'content-length',    # FastAPI will set this correctly
-    }
-    
-    return {
-        k: v for k, v in headers.items()
-        if k.lower() not in excluded_headers
-    }
+    cleaned = []
+    for key, value in raw_headers:
+        # Upstream header names keep their original casing
+        key = key.lower()
+        if key not in EXCLUDED_RESPONSE_HEADERS:
+            cleaned.append((key, value))
+
+    # Keep repeated headers such as Set-Cookie as separate entries
+    return MutableHeaders(raw=cleaned)
 
 def get_proxy_headers(request: Request) -> dict:
     """Generate proxy headers based on the incoming request."""
@@ -240,54 +527,78 @@ def get_proxy_headers(request: Request) -> dict:
 
     return headers
 
-async def forward_request(request: Request) -> Response:
-    upstream_url = os.getenv("UPSTREAM_SERVER_URL", "https://example.com/api")
-    full_url = f"{upstream_url}{request.url.path}"
+async def forward_request(request: Request, body, client: httpx.AsyncClient) -> Response:
+    """
+    Forward the request upstream and stream the response back.
+    `body` is either the already-read request body or an async iterator of its chunks.
+    """
+    url = request.url.path
     if request.url.query:
-        full_url = f"{full_url}?{request.url.query}"
+        url = f"{url}?{request.url.query}"
 
-    # Start with proxy headers
-    headers = get_proxy_headers(request)
-    
-    # Add original headers, except 'host'
-    headers.update({
-        key: value for key, value in request.headers.items()
-        if key.lower() != 'host'
-    })
+    # Forward the original headers as-is, except 'host' and hop-by-hop headers
+    headers = [
+        (key, value) for key, value in request.headers.raw
+        if key not in EXCLUDED_REQUEST_HEADERS
+    ]
 
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=request.method,
-                url=full_url,
-                headers=headers,
-                content=await request.body(),
-                timeout=30.0,  # 30 second timeout for upstream requests
-                follow_redirects=True
-            )
+    # Add proxy headers, unless the client already sent them
+    headers.extend(
+        (key, value) for key, value in get_proxy_headers(request).items()
+        if key not in request.headers
+    )
 
-            # Filter and clean response headers
-            cleaned_headers = filter_headers(dict(response.headers))
-            
-            # If the response has a content-type, preserve it
-            if 'content-type' in response.headers:
-                cleaned_headers['content-type'] = response.headers['content-type']
-
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                headers=cleaned_headers
-            )
+    try:
+        upstream_request = client.build_request(
+            method=request.method,
+            url=url,
+            headers=headers,
+            content=body,
+        )
+        # A streamed body cannot be replayed, so redirects are relayed to the client instead
+        response = await client.send(
+            upstream_request,
+            stream=True,
+            follow_redirects=isinstance(body, bytes),
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Forwarded %s %s%s: %s", request.method, UPSTREAM_SERVER_URL, url, response.status_code)
+
+        # Filter and clean response headers
+        cleaned_headers = filter_headers(response.headers.raw)
+
+        # Relay the body as it arrives; the upstream response is closed once it has been sent
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers=cleaned_headers,
+            background=BackgroundTask(response.aclose)
+        )
     except httpx.TimeoutException:
-        logger.error(f"Timeout while forwarding request to upstream service: {full_url}")
+        logger.error("Timeout while forwarding request to upstream service: %s%s", UPSTREAM_SERVER_URL, url)
         raise HTTPException(status_code=504, detail="Gateway Timeout - Upstream service took too long to respond")
     except httpx.ConnectError:
-        logger.error(f"Failed to connect to upstream service: {full_url}")
+        logger.error("Failed to connect to upstream service: %s%s", UPSTREAM_SERVER_URL, url)
         raise HTTPException(status_code=504, detail="Gateway Timeout - Unable to connect to upstream service")
     except Exception as e:
-        logger.error(f"Error forwarding request: {str(e)}")
+        logger.error("Error forwarding request: %s", e)
         raise HTTPException(status_code=502, detail="Bad Gateway")
 
+def default_workers() -> int:
+    """Count the CPUs this process may run on, which can be fewer than the host has."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "openapi_gateway:app",
+        host="0.0.0.0",
+        port=8000,
+        # "auto" picks uvloop and httptools when installed (see requirements.txt)
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WORKERS") or default_workers()),
+        access_log=False,  # Formatting an access log line per request is costly
+    )
@@ -0,0 +1,160 @@
+import importlib
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Mount, Route
+
+import openapi_gateway
+
+
+def base_spec(paths: dict, components: dict = None) -> dict:
+    spec = {
+        "openapi": "3.0.3",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": paths,
+    }
+    if components:
+        spec["components"] = components
+    return spec
+
+
+def ok_response() -> dict:
+    return {"200": {"description": "Successful response"}}
+
+
+async def echo(request: Request):
+    """Report what the upstream received."""
+    return JSONResponse({
+        "method": request.method,
+        "path": request.url.path,
+        "headers": dict(request.headers),
+        "body": (await request.body()).decode(),
+    })
+
+
+async def login(request: Request):
+    response = JSONResponse({"status": "logged in"})
+    response.set_cookie("session", "ALICE-SECRET")
+    return response
+
+
+async def report(request: Request):
+    return PlainTextResponse("a,b\n1,2\n", media_type="text/csv")
+
+
+upstream = Starlette(routes=[
+    Mount("/api", routes=[
+        Route("/login", login, methods=["POST"]),
+        Route("/report", report),
+        Route("/{path:path}", echo, methods=["GET", "POST", "PUT", "PATCH", "DELETE"]),
+    ]),
+])
+
+
+@pytest.fixture
+def make_gateway(monkeypatch, tmp_path):
+    """Return a factory that starts a fresh gateway for a spec, forwarding to `upstream`."""
+    def factory(spec: dict) -> TestClient:
+        # Reload so every test gets a new app without routes from earlier specs
+        gateway = importlib.reload(openapi_gateway)
+
+        spec_path = tmp_path / "openapi.json"
+        spec_path.write_text(json.dumps(spec))
+        monkeypatch.setattr(gateway, "OPENAPI_SPEC_PATH", str(spec_path))
+
+        create_upstream_client = gateway.create_upstream_client
+        monkeypatch.setattr(
+            gateway,
+            "create_upstream_client",
+            lambda: create_upstream_client(transport=httpx.ASGITransport(app=upstream)),
+        )
+        return TestClient(gateway.app)
+
+    return factory
+
+
+def test_forwards_upstream_content_type(make_gateway):
+    spec = base_spec({"/report": {"get": {"responses": ok_response()}}})
+    with make_gateway(spec) as client:
+        response = client.get("/report")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.text == "a,b\n1,2\n"
+
+
+def test_upstream_cookies_are_not_shared_between_clients(make_gateway):
+    spec = base_spec({
+        "/login": {"post": {"responses": ok_response()}},
+        "/whoami": {"get": {"responses": ok_response()}},
+    })
+    with make_gateway(spec) as alice:
+        response = alice.post("/login")
+        assert response.cookies["session"] == "ALICE-SECRET"
+
+        # A second client with its own (empty) cookie jar against the same gateway
+        bob = TestClient(alice.app)
+        response = bob.get("/whoami")
+        assert response.status_code == 200
+        assert "cookie" not in response.json()["headers"]
+
+        # Cookies sent by the client itself are still forwarded
+        response = bob.get("/whoami", headers={"cookie": "session=BOB"})
+        assert response.json()["headers"]["cookie"] == "session=BOB"
+
+
+def number_body_operation(schema: dict) -> dict:
+    return {
+        "requestBody": {"content": {"application/json": {"schema": schema}}},
+        "responses": ok_response(),
+    }
+
+
+# OpenAPI 3.0 follows JSON Schema draft-04, where exclusiveMinimum is a boolean
+EXCLUSIVE_NUMBER = {"type": "number", "minimum": 0, "exclusiveMinimum": True}
+
+
+def test_openapi_30_boolean_exclusive_minimum_starts(make_gateway):
+    spec = base_spec({
+        "/numbers": {"post": number_body_operation({
+            "type": "object",
+            "required": ["n"],
+            "properties": {"n": EXCLUSIVE_NUMBER},
+        })},
+        "/status": {"get": {"responses": ok_response()}},
+    })
+    with make_gateway(spec) as client:
+        assert client.get("/status").status_code == 200
+        assert client.post("/numbers", json={"n": 5}).status_code == 200
+        assert client.post("/numbers", json={"n": "five"}).status_code == 400
+
+
+def test_invalid_body_schema_only_disables_its_route(make_gateway):
+    # Keywords next to $ref are validated as Draft 2020-12, where a boolean
+    # exclusiveMinimum is not a valid schema
+    spec = base_spec(
+        {
+            "/numbers": {"post": number_body_operation({
+                "$ref": "#/components/schemas/Base",
+                "properties": {"n": EXCLUSIVE_NUMBER},
+            })},
+            "/status": {"get": {"responses": ok_response()}},
+        },
+        components={"schemas": {"Base": {"type": "object"}}},
+    )
+    with make_gateway(spec) as client:
+        assert client.get("/status").status_code == 200
+        assert client.post("/numbers", json={"n": "five"}).status_code == 200
+
+
+def test_openapi_30_exclusive_minimum_is_draft_04(make_gateway):
+    spec = base_spec({"/numbers": {"post": number_body_operation(EXCLUSIVE_NUMBER)}})
+    with make_gateway(spec) as client:
+        assert client.post("/numbers", json=0.5).status_code == 200
+        assert client.post("/numbers", json=1).status_code == 200
+        assert client.post("/numbers", json=0).status_code == 400